@@ -0,0 +1,208 @@
+'''
+network_test.py
+
+Runs TurretController against a local TCP stand-in for a serial-to-Ethernet
+server and compares command latency with a local serial port.
+
+Usage:
+    python network_test.py                 # stand-in server only
+    python network_test.py COM5            # also benchmark a local port
+Requires: pip install pyserial
+'''
+
+import os
+import serial
+import socketserver
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import turret_api
+from turret_api import TurretController
+
+ROUNDS = 20
+
+# Stand-in behaviour for failure cases: the 1OB 6 move answers late,
+# 1OB 7 never answers
+SLOW_MOVE_DELAY = 0.5
+TEST_TIMEOUT = 0.3
+
+
+class BXREMCBHandler(socketserver.StreamRequestHandler):
+    """
+    Answers BX-REMCB commands the way the real controller does
+    """
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        position = 1
+        logged_in = False
+        for line in self.rfile:
+            command = line.decode().strip()
+            if command == '1LOG IN':
+                logged_in = True
+                reply = '1LOG +'
+            elif command == '1LOG OUT':
+                logged_in = False
+                reply = '1LOG -'
+            elif command == 'LOG ?':
+                reply = f"LOG {int(logged_in)}"
+            elif command == '1OB ?':
+                reply = f"1OB {position}"
+            elif command == '1OB 7':
+                continue
+            elif command.startswith('1OB '):
+                if command == '1OB 6':
+                    time.sleep(SLOW_MOVE_DELAY)
+                position = int(command.split()[1])
+                reply = '1OB +'
+            else:
+                reply = 'X'
+            self.wfile.write(f"{reply}\r\n".encode())
+
+
+class DroppingHandler(socketserver.StreamRequestHandler):
+    """
+    Drops the connection after reading the first command
+    """
+
+    def handle(self):
+        self.rfile.readline()
+
+
+def start_server(handler=BXREMCBHandler):
+    """
+    Start a stand-in server on a free local port
+    """
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark(controller, label):
+    """
+    Time single queries against one pipelined batch of the same queries
+    """
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        controller._query('1OB ?')
+    single = (time.perf_counter() - start) / ROUNDS
+
+    start = time.perf_counter()
+    controller.send_commands(['1OB ?'] * ROUNDS)
+    batched = (time.perf_counter() - start) / ROUNDS
+
+    print(f"{label}: {single * 1000:.3f} ms/command single, "
+          f"{batched * 1000:.3f} ms/command batched")
+
+
+def run_network_test():
+    server = start_server()
+    url = f"socket://127.0.0.1:{server.server_address[1]}"
+
+    controller = TurretController(url)
+    assert controller.check_if_log_in()
+
+    controller.turn_to_position(3)
+    assert controller.check_position() == 3
+
+    responses = controller.send_commands(['1OB 5', '1OB ?'])
+    assert responses == [b'1OB +\r\n', b'1OB 5\r\n'], responses
+
+    # A second controller reuses the open, logged-in connection
+    second = TurretController(url)
+    assert second.Usart is controller.Usart
+    assert second.check_position() == 5
+    second.close()
+    assert controller.check_if_log_in()
+
+    benchmark(controller, url)
+    controller.close()
+
+    # Using a closed controller raises a clear error
+    try:
+        controller.check_position()
+        raise AssertionError("closed controller accepted a command")
+    except serial.SerialException as e:
+        assert str(e) == 'controller closed', e
+
+    server.shutdown()
+    print("Network test passed")
+
+
+def run_timeout_test():
+    server = start_server()
+    url = f"socket://127.0.0.1:{server.server_address[1]}"
+    controller = TurretController(url, timeout=TEST_TIMEOUT)
+
+    # A late reply is drained so the next command gets its own reply
+    try:
+        controller.send_commands(['1OB 6', '1OB ?'])
+        raise AssertionError("late reply not detected")
+    except serial.SerialTimeoutException as e:
+        print(f"Late reply detected: {e}")
+    assert controller.check_position() == 6
+
+    # A reply that never comes is detected the same way
+    try:
+        controller.send_commands(['1OB 7'])
+        raise AssertionError("missing reply not detected")
+    except serial.SerialTimeoutException as e:
+        print(f"Missing reply detected: {e}")
+    assert controller.check_position() == 6
+
+    controller.close()
+    server.shutdown()
+    print("Timeout test passed")
+
+
+def run_dropped_link_test():
+    server = start_server(DroppingHandler)
+    url = f"socket://127.0.0.1:{server.server_address[1]}"
+
+    # A link dropped during login leaves nothing behind, so every attempt
+    # opens a fresh connection
+    for _ in range(2):
+        try:
+            TurretController(url)
+            raise AssertionError("dropped link not detected")
+        except serial.SerialException as e:
+            print(f"Login failed as expected: {e}")
+        assert url not in turret_api._connections
+
+    server.shutdown()
+
+    # A connection that fails after login is replaced for new controllers
+    server = start_server()
+    url = f"socket://127.0.0.1:{server.server_address[1]}"
+    controller = TurretController(url)
+    controller.Usart._socket.close()
+    try:
+        controller.check_position()
+        raise AssertionError("failed connection not detected")
+    except serial.SerialException as e:
+        print(f"Connection failure detected: {e}")
+    assert url not in turret_api._connections
+
+    fresh = TurretController(url)
+    assert fresh.Usart is not controller.Usart
+    assert fresh.check_position() == 1
+    fresh.close()
+    controller.close()
+
+    server.shutdown()
+    print("Dropped link test passed")
+
+
+if __name__ == "__main__":
+    run_network_test()
+    run_timeout_test()
+    run_dropped_link_test()
+
+    if len(sys.argv) > 1:
+        local = TurretController(sys.argv[1])
+        benchmark(local, sys.argv[1])
+        local.close()
@@ -1,44 +1,232 @@
 # Usart Library
 import serial
+import socket
+import threading
 import time as t
 
+# URL schemes handled by pyserial's serial_for_url (serial-to-Ethernet servers)
+NETWORK_SCHEMES = ('socket://', 'rfc2217://')
+
+# Open, logged-in connections shared between controller instances, keyed by port
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def is_network_port(port):
+    """
+    Check if a port is a network URL rather than a local serial port
+
+    Args:
+        port (str): Local port name (e.g. 'COM5') or URL (e.g. 'socket://host:4001')
+
+    Returns:
+        bool: True if the port is a socket:// or rfc2217:// URL
+    """
+    return port.lower().startswith(NETWORK_SCHEMES)
+
+
+def open_transport(port, timeout=1):
+    """
+    Open the serial transport for a local port or a network URL
+
+    Args:
+        port (str): Local port name or socket:// / rfc2217:// URL
+        timeout (float): Read timeout in seconds
+
+    Returns:
+        serial.SerialBase: Open serial object
+    """
+    Usart = serial.serial_for_url(
+        port,
+        baudrate=19200,                     # BX-REMCB default baudrate
+        bytesize=serial.EIGHTBITS,             # 8 data bits
+        parity=serial.PARITY_EVEN,             # Even parity
+        stopbits=serial.STOPBITS_TWO,          # 2 stop bits
+        timeout=timeout                        # read timeout
+    )
+
+    # Disable Nagle so short commands are not held back waiting for an ACK
+    sock = getattr(Usart, '_socket', None)
+    if sock is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    return Usart
+
+
+class _Connection:
+    """
+    Open transport plus its login state, shared by controllers on the same port
+    """
+
+    def __init__(self, Usart, timeout):
+        self.Usart = Usart
+        self.timeout = timeout
+        self.lock = threading.RLock()
+        self.users = 0
+        self.logged_in = False
+
+
+def _discard(port, connection):
+    """
+    Remove a failed connection from the registry and close its transport
+
+    Later controllers on the same port then open a fresh transport instead
+    of reusing the dead one.
+    """
+    with _connections_lock:
+        if _connections.get(port) is connection:
+            del _connections[port]
+    try:
+        connection.Usart.close()
+    except Exception as e:
+        print(f"Error closing failed connection: {e}")
+
+
 class TurretController:
     """
     API class for controlling BX-REMCB turret controller
     """
     
-    def __init__(self, port='COM5'):
+    def __init__(self, port='COM5', timeout=1):
         """
         Initialize the serial port and log in to the controller
+
+        Args:
+            port (str): Local port name (e.g. 'COM5') or a network URL
+                (e.g. 'socket://192.168.0.10:4001', 'rfc2217://host:2217')
+            timeout (float): Read timeout in seconds. Only applies to the
+                first controller on a port; later controllers share its
+                connection and timeout.
         """
         print("Starting BX-REMCB controller")
-        
-        # Initialize serial connection
-        self.Usart = serial.Serial(
-            port=port,
-            baudrate=19200,                     # BX-REMCB default baudrate
-            bytesize=serial.EIGHTBITS,             # 8 data bits
-            parity=serial.PARITY_EVEN,             # Even parity
-            stopbits=serial.STOPBITS_TWO,          # 2 stop bits
-            timeout=1                              # 1 s read timeout
-        )
-        
-        # Check CTS status
-        if self.Usart.getCTS():
-            print("CTS asserted (ready to receive)")
-        else:
-            print("CTS de-asserted (not ready)")
-        
-        t.sleep(1)
-        
-        # Log in to the controller
-        self.Usart.write('1LOG IN\r\n'.encode())
-        current_response = self.Usart.readline()
-        
-        if current_response == b'1LOG +\r\n':
-            print("LOG IN successful!")
-        else:
-            print(f"Login failed. Response: {current_response}")
+        self.port = port
+
+        with _connections_lock:
+            self._connection = _connections.get(port)
+            if self._connection is None or not self._connection.Usart.is_open:
+                self._connection = _Connection(open_transport(port, timeout), timeout)
+                _connections[port] = self._connection
+            elif timeout != self._connection.timeout:
+                print(f"Warning: {port} already open with timeout "
+                      f"{self._connection.timeout} s, ignoring timeout {timeout} s")
+            self._connection.users += 1
+        self.Usart = self._connection.Usart
+
+        try:
+            self._log_in()
+        except Exception:
+            connection, last_user = self._release()
+            if last_user:
+                connection.Usart.close()
+            raise
+
+    def _log_in(self):
+        """
+        Log in to the controller unless the shared connection already is
+        """
+        with self._connection.lock:
+            if self._connection.logged_in:
+                print("Reusing logged-in connection")
+                return
+
+            # Check CTS status
+            if self.Usart.getCTS():
+                print("CTS asserted (ready to receive)")
+            else:
+                print("CTS de-asserted (not ready)")
+
+            # Local ports need time to settle after opening
+            if not is_network_port(self.port):
+                t.sleep(1)
+
+            # Log in to the controller
+            current_response = self._query('1LOG IN')
+
+            if current_response == b'1LOG +\r\n':
+                print("LOG IN successful!")
+                self._connection.logged_in = True
+            else:
+                print(f"Login failed. Response: {current_response}")
+
+    def _release(self):
+        """
+        Drop this controller's use of its connection
+
+        Returns:
+            tuple: The connection and True if this was its last user
+        """
+        connection, self._connection = self._connection, None
+        with _connections_lock:
+            connection.users -= 1
+            last_user = connection.users == 0
+            if last_user and _connections.get(self.port) is connection:
+                del _connections[self.port]
+        return connection, last_user
+
+    def _exchange(self, commands):
+        """
+        Write commands in one go and read one response line per command
+
+        Stops at the first empty or unterminated line, then drains any late
+        replies so they are not paired with a later command on the shared
+        connection. A SerialException drops the connection from the registry.
+
+        Returns:
+            list[bytes]: Responses read, ending early on a timeout
+        """
+        connection = self._connection
+        if connection is None:
+            raise serial.SerialException('controller closed')
+
+        with connection.lock:
+            try:
+                self.Usart.write(''.join(f"{c}\r\n" for c in commands).encode())
+                responses = []
+                for _ in commands:
+                    line = self.Usart.readline()
+                    responses.append(line)
+                    if not line.endswith(b'\r\n'):
+                        # Wait out stragglers until a full timeout passes quietly
+                        while self.Usart.readline():
+                            pass
+                        self.Usart.reset_input_buffer()
+                        break
+            except serial.SerialException:
+                _discard(self.port, connection)
+                raise
+        return responses
+
+    def _query(self, command):
+        """
+        Send a single command and read its one-line response
+        """
+        return self._exchange([command])[0]
+
+    def send_commands(self, commands):
+        """
+        Send several commands in one write and read back their responses
+
+        Pipelining the commands costs a single round trip instead of one per
+        command, which matters over serial-to-Ethernet servers.
+
+        Args:
+            commands (list[str]): Commands without the trailing CRLF
+
+        Returns:
+            list[bytes]: One response line per command, in order
+
+        Raises:
+            serial.SerialTimeoutException: A response did not arrive in time
+        """
+        if not commands:
+            return []
+
+        responses = self._exchange(commands)
+        if len(responses) < len(commands) or not responses[-1].endswith(b'\r\n'):
+            missing = commands[len(responses) - 1]
+            raise serial.SerialTimeoutException(
+                f"No reply to {missing!r}. Responses so far: {responses}")
+        return responses
     
     def check_if_log_in(self):
         """
@@ -47,8 +235,7 @@ class TurretController:
         Returns:
             bool: True if logged in, False otherwise
         """
-        self.Usart.write("LOG ?\r\n".encode())
-        response = self.Usart.readline()
+        response = self._query("LOG ?")
         
         # Check for valid response indicating logged in status
         if response and b'LOG 1' in response:
@@ -65,11 +252,8 @@ class TurretController:
         Args:
             value (int): Position number (1-6 for 6-place nosepiece)
         """
-        command = f"1OB {value}\r\n"
-        self.Usart.write(command.encode())
-        
-        # Read acknowledgement
-        ack = self.Usart.readline()
+        # Send command and read acknowledgement
+        ack = self._query(f"1OB {value}")
         print(f"Position {value} command sent. Response: {ack}")
         
         return ack
@@ -81,8 +265,7 @@ class TurretController:
         Returns:
             int: Current position number, or None if error
         """
-        self.Usart.write("1OB ?\r\n".encode())
-        response = self.Usart.readline()
+        response = self._query("1OB ?")
         
         try:
             # Parse response to extract position number
@@ -104,15 +287,30 @@ class TurretController:
     def close(self):
         """
         Log out of the device and close the serial port
+
+        The connection stays open while other controllers on the same port
+        still use it; the last one to close logs out and closes the port.
         """
+        if self._connection is None:
+            return
+
+        connection, last_user = self._release()
+
+        if not last_user:
+            print("Connection still in use, leaving port open")
+            return
+
         try:
-            # Log out
-            self.Usart.write('1LOG OUT\r\n'.encode())
-            logout_response = self.Usart.readline()
-            print(f"Logout response: {logout_response}")
-            
-            # Close serial port
-            self.Usart.close()
+            with connection.lock:
+                # Log out unless the link already failed
+                if self.Usart.is_open:
+                    self.Usart.write('1LOG OUT\r\n'.encode())
+                    logout_response = self.Usart.readline()
+                    print(f"Logout response: {logout_response}")
+                connection.logged_in = False
+
+                # Close serial port
+                self.Usart.close()
             print("Serial port closed")
         except Exception as e:
             print(f"Error during close: {e}")